@@ -72,6 +72,25 @@ event Claim:
     user: address
     value: uint256
 
+event AddressAdded:
+    user: address
+
+event AddressRemoved:
+    user: address
+
+
+# ================================================================== #
+# 🧱 Structs
+# ================================================================== #
+
+struct DistributionStats:
+    eligible_count: uint256
+    claimed_count: uint256
+    total_distributed: uint256
+    total_withdrawn: uint256
+    outstanding_liability: uint256
+    reward_balance: uint256
+
 
 # ================================================================== #
 # 💾 Storage
@@ -81,6 +100,12 @@ reward_token: public(IERC20)
 reward_amount: public(uint256)
 eligible_addresses: public(HashMap[address, bool])
 
+# Running distribution accounting, kept in sync by claims and admin calls
+eligible_count: public(uint256)
+claimed_count: public(uint256)
+total_distributed: public(uint256)
+total_withdrawn: public(uint256)
+
 
 # ================================================================== #
 # 🚧 Constructor
@@ -115,6 +140,34 @@ def pending_claim_amount(addr: address) -> uint256:
     return 0
 
 
+@external
+@view
+def outstanding_liability() -> uint256:
+    """
+    @notice Tokens committed to eligible addresses but not yet claimed
+    @return Amount of tokens owed to the current whitelist
+    """
+    return self.eligible_count * self.reward_amount
+
+
+@external
+@view
+def distribution_stats() -> DistributionStats:
+    """
+    @notice Snapshot of the distribution accounting in a single call
+    @return Eligible and claimed counts, distributed and withdrawn totals,
+            outstanding liability and current reward token balance
+    """
+    return DistributionStats(
+        eligible_count=self.eligible_count,
+        claimed_count=self.claimed_count,
+        total_distributed=self.total_distributed,
+        total_withdrawn=self.total_withdrawn,
+        outstanding_liability=self.eligible_count * self.reward_amount,
+        reward_balance=staticcall self.reward_token.balanceOf(self),
+    )
+
+
 # ================================================================== #
 # ✍️ Write Functions
 # ================================================================== #
@@ -149,7 +202,10 @@ def add_address(addr: address):
     """
 
     ownable._check_owner()
-    self.eligible_addresses[addr] = True
+    if not self.eligible_addresses[addr]:
+        self.eligible_addresses[addr] = True
+        self.eligible_count += 1
+        log AddressAdded(addr)
 
 
 @external
@@ -159,7 +215,10 @@ def remove_address(addr: address):
     @param addr Address to remove
     """
     ownable._check_owner()
-    self.eligible_addresses[addr] = False
+    if self.eligible_addresses[addr]:
+        self.eligible_addresses[addr] = False
+        self.eligible_count -= 1
+        log AddressRemoved(addr)
 
 
 @external
@@ -171,6 +230,10 @@ def withdraw_remaining(_token: IERC20):
     ownable._check_owner()
     amount: uint256 = staticcall _token.balanceOf(self)
     assert amount > 0, "!balance"
+
+    if _token == self.reward_token:
+        self.total_withdrawn += amount
+
     assert extcall _token.transfer(msg.sender, amount), "!transfer"
 
 
@@ -189,6 +252,9 @@ def _claim(_user: address):
 
     # Update state before transfer
     self.eligible_addresses[_user] = False
+    self.eligible_count -= 1
+    self.claimed_count += 1
+    self.total_distributed += _amount
 
     # Transfer tokens to the caller
     assert extcall self.reward_token.transfer(_user, _amount), "!transfer"
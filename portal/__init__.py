@@ -0,0 +1,4 @@
+from .eligibility_cache import CacheStats, EligibilityCache
+from .rpc import HttpRpc, RpcError, RpcLoader
+
+__all__ = ["CacheStats", "EligibilityCache", "HttpRpc", "RpcError", "RpcLoader"]
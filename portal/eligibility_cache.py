@@ -0,0 +1,261 @@
+"""
+Read-side cache for the claim portal backend.
+
+Answers `pending_claim_amount` lookups from a bounded LRU, batching misses
+into JSON-RPC batches of `eth_call`. The cache follows the contract's
+`Claim`, `AddressAdded` and `AddressRemoved` events with `eth_getLogs` and
+drops only the affected addresses, so a cached amount never outlives the
+claim that zeroed it. Concurrent misses on the same address share a single
+in-flight read.
+
+Reads are pinned to the newest block the cache has seen, which is never
+older than the last event applied, so a node lagging behind the events
+fails the read instead of refilling the cache with a pre-claim amount.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from eth_abi import decode
+from eth_utils import event_signature_to_log_topic, to_checksum_address
+
+from .rpc import RpcLoader
+
+EVENT_TOPICS = {
+    "0x" + event_signature_to_log_topic(signature).hex(): name
+    for name, signature in (
+        ("Claim", "Claim(address,uint256)"),
+        ("AddressAdded", "AddressAdded(address)"),
+        ("AddressRemoved", "AddressRemoved(address)"),
+    )
+}
+INVALIDATING_EVENTS = frozenset(EVENT_TOPICS.values())
+
+
+@dataclass
+class CacheStats:
+    lookups: int = 0
+    hits: int = 0
+    # misses includes coalesced keys, which waited on another caller's read
+    misses: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    evictions: int = 0
+    events: int = 0
+    invalidations: int = 0
+    lookup_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def mean_lookup_latency(self) -> float:
+        return self.lookup_seconds / self.lookups if self.lookups else 0.0
+
+    @property
+    def mean_fetch_latency(self) -> float:
+        return self.fetch_seconds / self.batches if self.batches else 0.0
+
+
+class EligibilityCache:
+    """
+    LRU cache in front of `pending_claim_amount`.
+
+    `rpc` is the node the contract at `address` is read from and its events
+    are polled from. `loader` receives a list of checksum addresses and the
+    block to read at (None for the latest block) and returns their pending
+    amounts in the same order. It defaults to an `RpcLoader` sending each
+    batch of misses as a single JSON-RPC batch.
+
+    Call `watch()` once and then `poll()` regularly, or run `listen()` in a
+    thread, to keep the cache in step with the chain.
+    """
+
+    def __init__(self, rpc, address, maxsize=10_000, max_batch=100, loader=None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be positive, got {max_batch}")
+
+        self.address = to_checksum_address(str(address))
+        self.maxsize = maxsize
+        self.max_batch = max_batch
+        self.stats = CacheStats()
+        # Newest block seen, misses are read at this block
+        self.block = None
+
+        self._rpc = rpc
+        self._loader = loader or RpcLoader(rpc, self.address)
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._next_block = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, addr) -> int:
+        """Pending claim amount for a single address"""
+        addr = to_checksum_address(addr)
+        return self.get_many([addr])[addr]
+
+    def get_many(self, addrs) -> dict:
+        """Pending claim amounts keyed by checksum address"""
+        start = time.perf_counter()
+        keys = list(dict.fromkeys(to_checksum_address(a) for a in addrs))
+        result = {}
+        owned = {}
+        waiting = {}
+
+        with self._lock:
+            block = self.block
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    result[key] = self._entries[key]
+                elif key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                else:
+                    owned[key] = self._inflight[key] = Future()
+            self.stats.hits += len(result)
+            self.stats.misses += len(owned) + len(waiting)
+            self.stats.coalesced += len(waiting)
+
+        try:
+            self._fetch(owned, block)
+        finally:
+            # Release anything left unresolved by a failing loader
+            self._resolve(owned, error=RuntimeError("loader did not complete"))
+
+        for key, future in {**owned, **waiting}.items():
+            result[key] = future.result()
+
+        with self._lock:
+            self.stats.lookups += 1
+            self.stats.lookup_seconds += time.perf_counter() - start
+        return result
+
+    def invalidate(self, addr, block=None):
+        """Drop the cached amount for an address, changed at `block` if known"""
+        addr = to_checksum_address(addr)
+        with self._lock:
+            if block is not None:
+                self.block = max(block, self.block or 0)
+            # Later callers must not join a read that predates the event
+            self._inflight.pop(addr, None)
+            if self._entries.pop(addr, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._inflight.clear()
+            self._entries.clear()
+
+    def on_event(self, name, user, block):
+        """Apply a single contract event by name, affected address and block"""
+        if name in INVALIDATING_EVENTS:
+            with self._lock:
+                self.stats.events += 1
+            self.invalidate(user, block)
+
+    def watch(self, from_block=None):
+        """
+        Start following the contract's events from `from_block`, by default
+        from the next block. Entries cached before are dropped, as no events
+        were followed to invalidate them.
+        """
+        head = self._head()
+        with self._lock:
+            self._inflight.clear()
+            self._entries.clear()
+            self._next_block = head + 1 if from_block is None else from_block
+            self.block = head
+
+    def poll(self) -> int:
+        """Apply events mined since the last poll, returns how many applied"""
+        with self._lock:
+            from_block = self._next_block
+        if from_block is None:
+            raise RuntimeError("watch() must be called before poll()")
+
+        head = self._head()
+        if head < from_block:
+            return 0
+
+        logs = self._rpc.request(
+            "eth_getLogs",
+            [
+                {
+                    "address": self.address,
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(head),
+                    "topics": [list(EVENT_TOPICS)],
+                }
+            ],
+        )
+        for log in logs:
+            # Every event carries the affected address as its first field
+            (user,) = decode(["address"], bytes.fromhex(log["data"][2:66]))
+            self.on_event(
+                EVENT_TOPICS[log["topics"][0]], user, int(log["blockNumber"], 16)
+            )
+
+        with self._lock:
+            self._next_block = max(self._next_block, head + 1)
+            self.block = max(self.block, head)
+        return len(logs)
+
+    def listen(self, stop, interval=1.0):
+        """Poll every `interval` seconds until the `stop` event is set"""
+        while not stop.is_set():
+            self.poll()
+            stop.wait(interval)
+
+    def _head(self):
+        return int(self._rpc.request("eth_blockNumber", []), 16)
+
+    def _fetch(self, owned, block):
+        keys = list(owned)
+        for i in range(0, len(keys), self.max_batch):
+            batch = keys[i : i + self.max_batch]
+            fetch_start = time.perf_counter()
+            try:
+                values = self._loader(batch, block)
+            except Exception as e:
+                self._resolve(owned, error=e)
+                raise
+            elapsed = time.perf_counter() - fetch_start
+
+            with self._lock:
+                self.stats.batches += 1
+                self.stats.fetch_seconds += elapsed
+            self._resolve({k: owned[k] for k in batch}, values=values)
+
+    def _resolve(self, futures, values=None, error=None):
+        with self._lock:
+            for i, (key, future) in enumerate(futures.items()):
+                if future.done():
+                    continue
+                # An event landing mid-fetch removes the in-flight entry, the
+                # read is still returned to callers but kept out of the cache
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                    if error is None:
+                        self._store(key, values[i])
+                if error is None:
+                    future.set_result(values[i])
+                else:
+                    future.set_exception(error)
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -0,0 +1,94 @@
+"""
+JSON-RPC plumbing for the claim portal backend.
+
+`HttpRpc` talks to a node over HTTP and sends several calls as one JSON-RPC
+batch. `RpcLoader` uses it to read `pending_claim_amount` for many addresses
+in a single round trip.
+"""
+
+import requests
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+PENDING_CLAIM_AMOUNT = function_signature_to_4byte_selector(
+    "pending_claim_amount(address)"
+)
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+
+
+class Rpc:
+    """
+    JSON-RPC client base.
+
+    Subclasses implement `_send`, which takes a list of request objects and
+    returns the list of reply objects in any order.
+    """
+
+    def request(self, method, params):
+        return self.batch([(method, params)])[0]
+
+    def batch(self, calls):
+        """Send `(method, params)` pairs as one batch, results in call order"""
+        if not calls:
+            return []
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        # Batch replies may come back in any order
+        replies = {reply["id"]: reply for reply in self._send(payload)}
+        results = []
+        for i in range(len(calls)):
+            reply = replies[i]
+            if "error" in reply:
+                raise RpcError(reply["error"]["code"], reply["error"]["message"])
+            results.append(reply["result"])
+        return results
+
+    def _send(self, payload):
+        raise NotImplementedError
+
+
+class HttpRpc(Rpc):
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def _send(self, payload):
+        response = self._session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class RpcLoader:
+    """
+    Batched `pending_claim_amount` reader.
+
+    Every call sends one JSON-RPC batch holding an `eth_call` per address,
+    executed at `block`, or at the latest block when it is None.
+    """
+
+    def __init__(self, rpc, address):
+        self.rpc = rpc
+        self.address = to_checksum_address(str(address))
+
+    def __call__(self, addrs, block=None):
+        tag = "latest" if block is None else hex(block)
+        calls = []
+        for addr in addrs:
+            data = PENDING_CLAIM_AMOUNT + encode(["address"], [addr])
+            calls.append(
+                ("eth_call", [{"to": self.address, "data": "0x" + data.hex()}, tag])
+            )
+
+        results = self.rpc.batch(calls)
+        if "0x" in results:
+            raise ValueError(f"no contract code at {self.address}")
+        return [int(result, 16) for result in results]
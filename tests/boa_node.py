@@ -0,0 +1,113 @@
+"""
+JSON-RPC node stand-in backed by the boa test environment.
+
+Only the calls the claim portal needs are served. Every batch received is
+recorded in `batches` so tests can check how reads were grouped.
+
+`transact` mines one block per transaction and keeps its logs for
+`eth_getLogs`. boa keeps no state history, so `eth_call` is only answered
+at the head block, like a node that has pruned everything older. A node
+created with `lag` reports a head that many blocks behind, standing in for
+a replica that has not caught up.
+"""
+
+import threading
+
+import boa
+from eth_utils import to_checksum_address
+
+from portal.rpc import Rpc
+
+
+def _error(request, code, message):
+    return {
+        "jsonrpc": "2.0",
+        "id": request["id"],
+        "error": {"code": code, "message": message},
+    }
+
+
+class BoaNode(Rpc):
+    def __init__(self, env=None, lag=0):
+        self.env = env or boa.env
+        self.lag = lag
+        self.batches = []
+        self.logs = []
+        # The boa environment is not thread safe
+        self._lock = threading.Lock()
+
+    def handle(self, payload):
+        """Answer a list of JSON-RPC requests"""
+        with self._lock:
+            self.batches.append([request["method"] for request in payload])
+            return [self._reply(request) for request in payload]
+
+    def _send(self, payload):
+        return self.handle(payload)
+
+    def transact(self, sender, contract, fn, *args):
+        """Mine a block holding a single transaction"""
+        with self._lock:
+            self.env.time_travel(blocks=1)
+            block = self.env.evm.patch.block_number
+            computation = self.env.execute_code(
+                to_address=contract.address,
+                sender=sender,
+                data=getattr(contract, fn).prepare_calldata(*args),
+            )
+            if computation.is_error:
+                raise computation.error
+            for _, address, topics, data in computation.get_raw_log_entries():
+                self.logs.append(
+                    {
+                        "address": to_checksum_address(address),
+                        "topics": [f"0x{t:064x}" for t in topics],
+                        "data": "0x" + data.hex(),
+                        "blockNumber": hex(block),
+                    }
+                )
+
+    @property
+    def head(self):
+        return self.env.evm.patch.block_number - self.lag
+
+    def _reply(self, request):
+        method = getattr(self, "_" + request["method"], None)
+        if method is None:
+            return _error(request, -32601, f"method {request['method']} not found")
+        try:
+            result = method(*request["params"])
+        except ValueError as e:
+            return _error(request, -32000, str(e))
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def _eth_blockNumber(self):
+        return hex(self.head)
+
+    def _eth_call(self, tx, block):
+        if block != "latest":
+            if int(block, 16) > self.head:
+                raise ValueError("header not found")
+            if int(block, 16) < self.env.evm.patch.block_number:
+                raise ValueError("missing trie node")
+        computation = self.env.execute_code(
+            to_address=to_checksum_address(tx["to"]),
+            data=bytes.fromhex(tx["data"].removeprefix("0x")),
+            is_modifying=False,
+        )
+        if computation.is_error:
+            raise ValueError("execution reverted")
+        return "0x" + computation.output.hex()
+
+    def _eth_getLogs(self, log_filter):
+        from_block = int(log_filter["fromBlock"], 16)
+        to_block = min(int(log_filter["toBlock"], 16), self.head)
+        address = to_checksum_address(log_filter["address"])
+        topics = log_filter["topics"][0]
+        return [
+            log
+            for log in self.logs
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+            and log["address"] == address
+            and log["topics"][0] in topics
+        ]
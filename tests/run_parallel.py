@@ -0,0 +1,302 @@
+"""
+Parallel runner for the Hypothesis property tests.
+
+Every property test is split into shards that each explore a fresh random
+seed, and the shards are spread across a process pool. Each worker runs
+pytest in-process against its own fresh `boa.Env`, loads compiled
+contracts from boa's disk cache and writes to a private copy of the
+Hypothesis example database.
+Failures are merged by shrunk example across shards, and the example
+databases are merged back into `.hypothesis/examples` once the pool has
+finished.
+
+Seeds are deliberately not forced, as Hypothesis disables the example
+database under `--hypothesis-seed`. Rerunning a failing test with plain
+pytest replays the shrunk example from the merged database.
+
+Usage:
+    python tests/run_parallel.py --workers 4 --shards 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CONTRACTS = ("contracts/SurveyAirdrop.vy", "contracts/mocks/MockToken.vy")
+EXAMPLE_DB = ROOT / ".hypothesis" / "examples"
+
+
+@dataclass
+class Failure:
+    nodeid: str
+    shard: int
+    when: str
+    report: str
+    example: str
+    blob: str
+
+
+@dataclass
+class ShardResult:
+    nodeid: str
+    shard: int
+    passed: int = 0
+    failures: list[Failure] = field(default_factory=list)
+
+
+class _Collector:
+    """Pytest plugin recording outcomes of a single shard"""
+
+    def __init__(self, result):
+        self.result = result
+
+    def pytest_runtest_logreport(self, report):
+        if report.passed and report.when == "call":
+            self.result.passed += 1
+        elif report.failed:
+            self.result.failures.append(
+                Failure(
+                    nodeid=self.result.nodeid,
+                    shard=self.result.shard,
+                    when=report.when,
+                    report=report.longreprtext,
+                    example=shrunk_example(report.longreprtext),
+                    blob=reproduce_blob(report.longreprtext),
+                )
+            )
+
+
+class _PropertyTests:
+    """Pytest plugin recording the node ids of Hypothesis tests"""
+
+    def __init__(self):
+        self.nodeids = []
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            if getattr(getattr(item, "obj", None), "is_hypothesis_test", False):
+                # Node ids are relative to the rootdir, rebuild them from the
+                # file path so tests outside the repo can be selected again
+                path = item.path
+                if path.is_relative_to(ROOT):
+                    path = path.relative_to(ROOT)
+                parts = item.nodeid.split("::")[1:]
+                self.nodeids.append("::".join([str(path), *parts]))
+
+
+def _report_lines(text):
+    for line in text.splitlines():
+        yield line[1:].strip() if line.startswith("E ") else line
+
+
+def shrunk_example(text):
+    """Extract the `Falsifying example` block from a pytest failure report"""
+    lines = []
+    in_example = False
+    for line in _report_lines(text):
+        if line.startswith("Falsifying example"):
+            in_example = True
+        if in_example:
+            lines.append(line)
+        if line == ")":
+            in_example = False
+    return "\n".join(lines)
+
+
+def reproduce_blob(text):
+    """Extract the `@reproduce_failure` hint from a pytest failure report"""
+    for line in _report_lines(text):
+        if "@reproduce_failure" in line:
+            return line
+    return ""
+
+
+def group_failures(failures):
+    """
+    Merge failures reported by several shards.
+
+    Shards of the same test usually shrink to the same falsifying example,
+    so failures are keyed on the test, the phase that failed (setup, call,
+    teardown or session) and the example, or the full report when there is
+    no example. Each group lists the shards that hit it.
+    """
+    groups = {}
+    for failure in failures:
+        key = (failure.nodeid, failure.when, failure.example or failure.report)
+        groups.setdefault(key, []).append(failure)
+    return [(group[0], [f.shard for f in group]) for group in groups.values()]
+
+
+def collect_property_tests(paths):
+    import pytest
+
+    plugin = _PropertyTests()
+    code = pytest.main(
+        ["--collect-only", "-p", "no:cacheprovider", "-p", "no:terminal"] + list(paths),
+        plugins=[plugin],
+    )
+    if code not in (pytest.ExitCode.OK, pytest.ExitCode.NO_TESTS_COLLECTED):
+        raise SystemExit(
+            f"Collection failed with exit code {code}, "
+            f"run `pytest --collect-only {' '.join(paths)}` for details"
+        )
+    return plugin.nodeids
+
+
+def warm_contract_cache():
+    """Compile the contracts once so workers load them from boa's disk cache"""
+    import boa
+
+    for path in CONTRACTS:
+        boa.load_partial(path)
+
+
+def _init_worker(shard_root, example_db):
+    # Fixtures load contracts by relative path, only the spawned worker
+    # moves to the repo root, the calling process is left untouched
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT / "tests"))
+
+    # Results are reported by the parent, keep worker sessions quiet
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.dup2(devnull, sys.stderr.fileno())
+
+    from hypothesis import settings
+    from hypothesis.database import DirectoryBasedExampleDatabase
+
+    # Populates boa's disk cache, later loads in any worker skip compilation
+    warm_contract_cache()
+
+    # Private database seeded from the shared one, the profile has to be
+    # loaded before the test modules import and bind their settings.
+    # Hypothesis loads a derandomized `ci` profile under CI, which would make
+    # every shard draw the same examples, so randomness is forced back on.
+    db_path = Path(tempfile.mkdtemp(prefix="worker-", dir=shard_root))
+    if example_db.is_dir():
+        shutil.copytree(example_db, db_path, dirs_exist_ok=True)
+    settings.register_profile(
+        "parallel",
+        database=DirectoryBasedExampleDatabase(db_path),
+        derandomize=False,
+        print_blob=True,
+    )
+    settings.load_profile("parallel")
+
+
+def _run_shard(nodeid, shard):
+    import boa
+    import pytest
+
+    result = ShardResult(nodeid=nodeid, shard=shard)
+    with boa.swap_env(boa.Env()):
+        code = pytest.main(
+            [nodeid, "-p", "no:cacheprovider"],
+            plugins=[_Collector(result)],
+        )
+    if code not in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        result.failures.append(
+            Failure(
+                nodeid=nodeid,
+                shard=shard,
+                when="session",
+                report=f"pytest exited with {code!r}",
+                example="",
+                blob="",
+            )
+        )
+    return result
+
+
+def _entries(path):
+    return {p.relative_to(path) for p in path.rglob("*") if p.is_file()}
+
+
+def merge_databases(main, shards):
+    """
+    Merge worker example databases into `main`.
+
+    The directory database is content addressed, so merging is a set
+    operation on files: new examples from any worker are added, and an
+    existing example is dropped if any worker deleted it while replaying.
+    """
+    main.mkdir(parents=True, exist_ok=True)
+    original = _entries(main)
+    survivors = set(original)
+    for shard in shards:
+        entries = _entries(shard)
+        survivors &= entries
+        for entry in entries - original:
+            target = main / entry
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(shard / entry, target)
+
+    for entry in original - survivors:
+        (main / entry).unlink()
+
+
+def run(paths, workers, shards_per_test, example_db=EXAMPLE_DB):
+    # Workers run from the repo root, so paths are resolved against the
+    # caller's working directory first
+    paths = [str(Path(p).resolve()) for p in paths]
+    example_db = Path(example_db).resolve()
+
+    shard_root = Path(tempfile.mkdtemp(prefix="hypothesis-shards-"))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shard_root, example_db),
+        ) as pool:
+            # Collection imports the test modules, keep it out of this process
+            nodeids = pool.submit(collect_property_tests, paths).result()
+            shards = [(n, i) for n in nodeids for i in range(shards_per_test)]
+            print(
+                f"Running {len(nodeids)} property tests x {shards_per_test} "
+                f"shards on {workers} workers"
+            )
+            results = list(pool.map(_run_shard, *zip(*shards))) if shards else []
+        merge_databases(example_db, sorted(shard_root.iterdir()))
+    finally:
+        shutil.rmtree(shard_root, ignore_errors=True)
+
+    failures = [f for r in results for f in r.failures]
+    passed = sum(r.passed for r in results)
+    groups = group_failures(failures)
+    for failure, shard_ids in groups:
+        shard_list = ", ".join(str(i) for i in shard_ids)
+        print(
+            f"\n{'=' * 70}\nFAILED {failure.nodeid} during {failure.when} "
+            f"(shards {shard_list})"
+        )
+        print(failure.example or failure.report)
+        if failure.blob:
+            print(failure.blob)
+        print(f"Reproduce: pytest {failure.nodeid}")
+
+    print(
+        f"\n{passed} shards passed, {len(failures)} failed, " f"{len(groups)} distinct"
+    )
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=["tests"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=4, help="shards per test")
+    args = parser.parse_args(argv)
+
+    return run(args.paths, args.workers, args.shards)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
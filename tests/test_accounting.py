@@ -0,0 +1,96 @@
+import boa
+
+
+def test_initial_accounting(survey, token):
+    """Test counters start empty and the balance is reported"""
+    assert survey.distribution_stats() == (
+        0,
+        0,
+        0,
+        0,
+        0,
+        token.balanceOf(survey.address),
+    )
+
+
+def test_whitelist_updates_eligible_count(survey, owner, alice, bob, reward_amount):
+    """Test adding and removing addresses keeps the eligible count exact"""
+    with boa.env.prank(owner):
+        survey.add_address(alice)
+        survey.add_address(bob)
+        # Re-adding an eligible address must not double count
+        survey.add_address(alice)
+
+    assert survey.eligible_count() == 2
+    assert survey.outstanding_liability() == 2 * reward_amount
+
+    with boa.env.prank(owner):
+        survey.remove_address(bob)
+        # Removing an ineligible address must not underflow
+        survey.remove_address(bob)
+
+    assert survey.eligible_count() == 1
+    assert survey.outstanding_liability() == reward_amount
+
+
+def test_claim_updates_accounting(survey, owner, alice, bob, reward_amount):
+    """Test claims move liability into the distributed total"""
+    with boa.env.prank(owner):
+        survey.add_address(alice)
+        survey.add_address(bob)
+
+    with boa.env.prank(alice):
+        survey.claim()
+
+    eligible, claimed, distributed, _, liability, _ = survey.distribution_stats()
+    assert eligible == 1
+    assert claimed == 1
+    assert distributed == reward_amount
+    assert liability == reward_amount
+
+    with boa.env.prank(alice):
+        survey.claim_for(bob)
+
+    eligible, claimed, distributed, _, liability, _ = survey.distribution_stats()
+    assert eligible == 0
+    assert claimed == 2
+    assert distributed == 2 * reward_amount
+    assert liability == 0
+
+
+def test_failed_claim_leaves_accounting(survey, owner, alice):
+    """Test a reverted claim does not touch the counters"""
+    with boa.env.prank(alice):
+        with boa.reverts("!address"):
+            survey.claim()
+
+    assert survey.claimed_count() == 0
+    assert survey.total_distributed() == 0
+
+
+def test_withdraw_updates_accounting(survey, owner, alice, token, reward_amount):
+    """Test reward token withdrawals are tracked and liability is kept"""
+    with boa.env.prank(owner):
+        survey.add_address(alice)
+
+    contract_balance = token.balanceOf(survey.address)
+
+    with boa.env.prank(owner):
+        survey.withdraw_remaining(token.address)
+
+    _, _, _, withdrawn, liability, balance = survey.distribution_stats()
+    assert withdrawn == contract_balance
+    assert balance == 0
+    # Alice is still owed her reward even though the contract is empty
+    assert liability == reward_amount
+
+
+def test_withdraw_other_token_not_tracked(survey, owner):
+    """Test withdrawing a non-reward token leaves the withdrawn total alone"""
+    other_token = boa.load_partial("contracts/mocks/MockToken.vy")
+    with boa.env.prank(owner):
+        other = other_token.deploy("Other", "OTH", 18)
+        other._mint_for_testing(survey.address, 1_000)
+        survey.withdraw_remaining(other.address)
+
+    assert survey.total_withdrawn() == 0
@@ -0,0 +1,409 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boa
+import pytest
+from boa_node import BoaNode
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from portal import EligibilityCache, HttpRpc, RpcError, RpcLoader
+
+
+@pytest.fixture
+def node():
+    return BoaNode()
+
+
+@pytest.fixture
+def cache(node, survey):
+    cache = EligibilityCache(node, survey.address)
+    cache.watch()
+    return cache
+
+
+def transact(node, cache, contract, sender, fn, *args):
+    """Mine a transaction and let the cache catch up through eth_getLogs"""
+    node.transact(sender, contract, fn, *args)
+    cache.poll()
+
+
+def test_miss_then_hit(node, cache, survey, owner, alice, reward_amount):
+    """Test repeated lookups are served from the cache"""
+    transact(node, cache, survey, owner, "add_address", alice)
+
+    assert cache.get(alice) == reward_amount
+    assert cache.get(alice) == reward_amount
+
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.hit_rate == 0.5
+    assert cache.stats.lookups == 2
+    assert cache.stats.mean_lookup_latency > 0
+    assert cache.stats.mean_fetch_latency > 0
+
+
+def test_claim_invalidates_entry(node, cache, survey, owner, alice, bob, reward_amount):
+    """Test a claim is never answered with the pre-claim amount"""
+    transact(node, cache, survey, owner, "add_address", alice)
+    transact(node, cache, survey, owner, "add_address", bob)
+    assert cache.get_many([alice, bob]) == {alice: reward_amount, bob: reward_amount}
+
+    transact(node, cache, survey, alice, "claim")
+
+    assert cache.get(alice) == 0
+    # Only the claimant's entry is dropped
+    assert cache.get(bob) == reward_amount
+    assert cache.stats.events == 3
+    assert cache.stats.invalidations == 1
+    assert cache.stats.hits == 1
+
+
+def test_claim_for_invalidates_recipient(node, cache, survey, owner, alice, bob):
+    """Test claiming on behalf of an address invalidates the recipient"""
+    transact(node, cache, survey, owner, "add_address", alice)
+    cache.get(alice)
+
+    transact(node, cache, survey, bob, "claim_for", alice)
+
+    assert cache.get(alice) == 0
+
+
+def test_whitelist_changes_invalidate(node, cache, survey, owner, alice, reward_amount):
+    """Test adding and removing addresses invalidates their entries"""
+    assert cache.get(alice) == 0
+
+    transact(node, cache, survey, owner, "add_address", alice)
+    assert cache.get(alice) == reward_amount
+
+    transact(node, cache, survey, owner, "remove_address", alice)
+    assert cache.get(alice) == 0
+
+
+def test_reads_pinned_to_polled_block(node, cache, survey, owner, alice):
+    """Test misses are read at the block the cache has caught up to"""
+    transact(node, cache, survey, owner, "add_address", alice)
+    assert cache.block == node.head
+
+    node.transact(owner, survey, "remove_address", alice)
+
+    # The node only serves its head, the read at the polled block fails
+    with pytest.raises(RpcError, match="missing trie node"):
+        cache.get(alice)
+    cache.poll()
+    assert cache.get(alice) == 0
+
+
+def test_lagging_loader_not_cached(node, survey, owner, alice, reward_amount):
+    """Test a replica behind the applied events cannot serve the pre-claim amount"""
+    replica = BoaNode()
+    cache = EligibilityCache(
+        node, survey.address, loader=RpcLoader(replica, survey.address)
+    )
+    cache.watch()
+    transact(node, cache, survey, owner, "add_address", alice)
+    assert cache.get(alice) == reward_amount
+
+    replica.lag = 1
+    transact(node, cache, survey, alice, "claim")
+
+    with pytest.raises(RpcError, match="header not found"):
+        cache.get(alice)
+    assert len(cache) == 0
+
+    replica.lag = 0
+    assert cache.get(alice) == 0
+
+
+def test_watch_from_block(node, survey, owner, alice):
+    """Test events mined before watch() are replayed from from_block"""
+    cache = EligibilityCache(node, survey.address)
+    with pytest.raises(RuntimeError):
+        cache.poll()
+
+    start = node.head + 1
+    node.transact(owner, survey, "add_address", alice)
+    node.transact(owner, survey, "remove_address", alice)
+    cache.watch(from_block=start)
+
+    assert cache.poll() == 2
+    assert cache.stats.events == 2
+    assert cache.poll() == 0
+
+
+def test_listen_applies_events(node, cache, survey, owner, alice):
+    """Test a listener thread invalidates entries without manual polling"""
+    transact(node, cache, survey, owner, "add_address", alice)
+    cache.get(alice)
+
+    stop = threading.Event()
+    listener = threading.Thread(
+        target=cache.listen, args=(stop,), kwargs={"interval": 0.01}
+    )
+    listener.start()
+    try:
+        node.transact(alice, survey, "claim")
+        wait_for(lambda: cache.stats.invalidations == 1)
+    finally:
+        stop.set()
+        listener.join(timeout=5)
+
+    assert cache.get(alice) == 0
+
+
+def test_batched_misses(node, survey, owner):
+    """Test misses reach the node as JSON-RPC batches of at most max_batch calls"""
+    cache = EligibilityCache(node, survey.address, max_batch=3)
+    addrs = [boa.env.generate_address() for _ in range(7)]
+    with boa.env.prank(owner):
+        for addr in addrs[:4]:
+            survey.add_address(addr)
+
+    amounts = cache.get_many(addrs + addrs[:2])
+
+    assert [len(batch) for batch in node.batches] == [3, 3, 1]
+    assert all(method == "eth_call" for batch in node.batches for method in batch)
+    assert cache.stats.batches == 3
+    assert amounts == {a: survey.pending_claim_amount(a) for a in addrs}
+
+    # Everything is cached now
+    cache.get_many(addrs)
+    assert len(node.batches) == 3
+
+
+def test_node_errors_are_raised(node, token, alice):
+    """Test a failing eth_call surfaces as an RpcError and is not cached"""
+    cache = EligibilityCache(node, token.address)
+
+    with pytest.raises(RpcError):
+        cache.get(alice)
+    assert len(cache) == 0
+
+    cache = EligibilityCache(node, alice)
+    with pytest.raises(ValueError, match="no contract code"):
+        cache.get(alice)
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"max_batch": 0}])
+def test_invalid_arguments(node, survey, kwargs):
+    """Test non-positive sizes are rejected"""
+    with pytest.raises(ValueError):
+        EligibilityCache(node, survey.address, **kwargs)
+
+
+def test_lru_eviction(node, survey):
+    """Test the least recently used entry is evicted at capacity"""
+    cache = EligibilityCache(node, survey.address, maxsize=2)
+    a, b, c = (boa.env.generate_address() for _ in range(3))
+
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)
+    cache.get(c)
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    # b was the least recently used
+    cache.get(b)
+    assert cache.stats.misses == 4
+
+
+def test_ignores_other_contracts(
+    node, cache, survey, owner, token, alice, reward_amount
+):
+    """Test events from another airdrop do not invalidate this cache"""
+    other = boa.load_partial("contracts/SurveyAirdrop.vy")
+    with boa.env.prank(owner):
+        other_survey = other.deploy(token.address, reward_amount)
+        token.transfer(other_survey.address, reward_amount)
+
+    transact(node, cache, survey, owner, "add_address", alice)
+    cache.get(alice)
+
+    transact(node, cache, other_survey, owner, "add_address", alice)
+    transact(node, cache, other_survey, alice, "claim")
+
+    assert cache.stats.events == 1
+    assert cache.stats.invalidations == 0
+    assert cache.get(alice) == reward_amount
+    assert cache.stats.hits == 1
+
+
+def test_event_during_fetch_not_cached(node, survey, owner, alice, reward_amount):
+    """Test a read racing a polled event is returned but not cached"""
+    read = RpcLoader(node, survey.address)
+    racing = [True]
+
+    def loader(addrs, block):
+        values = read(addrs, block)
+        if racing:
+            racing.pop()
+            transact(node, cache, survey, owner, "remove_address", alice)
+        return values
+
+    cache = EligibilityCache(node, survey.address, loader=loader)
+    cache.watch()
+    transact(node, cache, survey, owner, "add_address", alice)
+
+    assert cache.get(alice) == reward_amount
+    assert len(cache) == 0
+    assert cache.get(alice) == 0
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_misses_share_one_read(node, survey, owner, alice, reward_amount):
+    """Test concurrent lookups of the same address trigger a single read"""
+    with boa.env.prank(owner):
+        survey.add_address(alice)
+
+    calls = []
+    release = threading.Event()
+
+    def loader(addrs, block):
+        calls.append(addrs)
+        assert release.wait(timeout=5)
+        return [survey.pending_claim_amount(a) for a in addrs]
+
+    cache = EligibilityCache(node, survey.address, loader=loader)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(alice)))
+        for _ in range(4)
+    ]
+
+    threads[0].start()
+    wait_for(lambda: calls)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: cache.stats.coalesced == 3)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [[alice]]
+    assert results == [reward_amount] * 4
+    assert cache.stats.misses == 4
+    assert cache.get(alice) == reward_amount
+    assert len(calls) == 1
+
+
+def test_loader_error_reaches_waiters(node, survey, alice):
+    """Test a failing read is raised to every waiter and not cached"""
+    started = threading.Event()
+    release = threading.Event()
+    failing = [True]
+
+    def loader(addrs, block):
+        if failing[0]:
+            started.set()
+            assert release.wait(timeout=5)
+            raise ConnectionError("rpc down")
+        return [0] * len(addrs)
+
+    cache = EligibilityCache(node, survey.address, loader=loader)
+    errors = []
+
+    def lookup():
+        try:
+            cache.get(alice)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(2)]
+    threads[0].start()
+    assert started.wait(timeout=5)
+    threads[1].start()
+    wait_for(lambda: cache.stats.coalesced == 1)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(errors) == 2
+    failing[0] = False
+    assert cache.get(alice) == 0
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps(self.server.node.handle(payload)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def rpc_url(node):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RpcHandler)
+    server.node = node
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_rpc_end_to_end(rpc_url, node, survey, owner, alice, bob, reward_amount):
+    """Test the cache following events and reading through a node over HTTP"""
+    cache = EligibilityCache(HttpRpc(rpc_url), survey.address)
+    cache.watch()
+    transact(node, cache, survey, owner, "add_address", alice)
+
+    assert cache.get_many([alice, bob]) == {alice: reward_amount, bob: 0}
+    assert node.batches[-1] == ["eth_call", "eth_call"]
+
+    transact(node, cache, survey, alice, "claim")
+
+    assert node.batches[-1] == ["eth_getLogs"]
+    assert cache.get(alice) == 0
+    assert cache.get(bob) == 0
+    assert cache.stats.batches == 2
+
+
+@given(
+    actions=st.lists(
+        st.tuples(
+            st.sampled_from(["add", "remove", "claim", "read"]),
+            st.integers(min_value=0, max_value=4),
+        ),
+        min_size=1,
+        max_size=20,
+    )
+)
+@settings(
+    max_examples=30,
+    deadline=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture],
+)
+def test_cache_never_stale(survey, owner, actions):
+    """Test cached reads always match the contract through random actions"""
+    node = BoaNode()
+    cache = EligibilityCache(node, survey.address, maxsize=3)
+    cache.watch()
+    users = [boa.env.generate_address() for _ in range(5)]
+
+    for action, idx in actions:
+        user = users[idx]
+        if action == "add":
+            transact(node, cache, survey, owner, "add_address", user)
+        elif action == "remove":
+            transact(node, cache, survey, owner, "remove_address", user)
+        elif action == "claim" and survey.eligible_addresses(user):
+            transact(node, cache, survey, user, "claim")
+
+        assert cache.get_many(users) == {
+            u: survey.pending_claim_amount(u) for u in users
+        }
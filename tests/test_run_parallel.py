@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import run_parallel
+from run_parallel import (
+    Failure,
+    group_failures,
+    merge_databases,
+    reproduce_blob,
+    shrunk_example,
+)
+
+
+def write(path, content=b""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def test_merge_adds_new_examples(tmp_path):
+    """Test examples found by any worker end up in the main database"""
+    main = tmp_path / "main"
+    worker_a = tmp_path / "a"
+    worker_b = tmp_path / "b"
+    write(main / "key" / "old")
+    for worker in (worker_a, worker_b):
+        write(worker / "key" / "old")
+    write(worker_a / "key" / "new_a", b"a")
+    write(worker_b / "other" / "new_b", b"b")
+
+    merge_databases(main, [worker_a, worker_b])
+
+    assert (main / "key" / "old").exists()
+    assert (main / "key" / "new_a").read_bytes() == b"a"
+    assert (main / "other" / "new_b").read_bytes() == b"b"
+
+
+def test_merge_drops_deleted_examples(tmp_path):
+    """Test an example deleted by one worker is removed from the main database"""
+    main = tmp_path / "main"
+    worker_a = tmp_path / "a"
+    worker_b = tmp_path / "b"
+    write(main / "key" / "fixed")
+    write(worker_a / "key" / "fixed")
+    worker_b.mkdir()
+
+    merge_databases(main, [worker_a, worker_b])
+
+    assert not (main / "key" / "fixed").exists()
+
+
+def test_shrunk_example_extraction():
+    """Test the falsifying example is pulled out of a pytest report"""
+    report = "\n".join(
+        [
+            ">       assert x < 1000",
+            "E       AssertionError",
+            "E       Falsifying example: test_fail(",
+            "E           x=1000,",
+            "E       )",
+            "E       You can reproduce this example by temporarily adding "
+            "@reproduce_failure('6.125.1', b'AEID6A==') as a decorator",
+            "",
+            "tests/test_example.py:5: AssertionError",
+        ]
+    )
+
+    assert shrunk_example(report).splitlines() == [
+        "Falsifying example: test_fail(",
+        "x=1000,",
+        ")",
+    ]
+    assert reproduce_blob(report) == (
+        "You can reproduce this example by temporarily adding "
+        "@reproduce_failure('6.125.1', b'AEID6A==') as a decorator"
+    )
+
+
+def test_group_failures():
+    """Test identical failures from several shards are reported once"""
+
+    def failure(nodeid, shard, example, when="call"):
+        return Failure(nodeid, shard, when, "report", example, "")
+
+    failures = [
+        failure("test_a", 0, "x=1000"),
+        failure("test_a", 1, "x=1000"),
+        failure("test_a", 2, "x=-1"),
+        failure("test_b", 0, "x=1000"),
+        failure("test_b", 1, "x=1000", when="teardown"),
+    ]
+
+    groups = [
+        (f.nodeid, f.when, f.example, shards) for f, shards in group_failures(failures)
+    ]
+
+    assert groups == [
+        ("test_a", "call", "x=1000", [0, 1]),
+        ("test_a", "call", "x=-1", [2]),
+        ("test_b", "call", "x=1000", [0]),
+        ("test_b", "teardown", "x=1000", [1]),
+    ]
+
+
+DRAWS_TEST = """
+import uuid
+from pathlib import Path
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+
+@pytest.fixture(scope="session")
+def record():
+    with open(Path({out!r}) / uuid.uuid4().hex, "w") as f:
+        yield f
+
+
+@given(x=st.integers())
+@settings(max_examples=20)
+def test_draws(record, x):
+    record.write(f"{{x}}\\n")
+"""
+
+
+def test_shards_draw_different_examples(tmp_path, monkeypatch):
+    """Test shards explore different examples, even under the CI profile"""
+    out = tmp_path / "draws"
+    out.mkdir()
+    test_file = tmp_path / "test_draws.py"
+    test_file.write_text(DRAWS_TEST.format(out=str(out)))
+    example_db = tmp_path / "db"
+
+    monkeypatch.setenv("CI", "true")
+    monkeypatch.chdir(tmp_path)
+
+    code = run_parallel.run(
+        [test_file.name], workers=2, shards_per_test=2, example_db=example_db
+    )
+
+    assert code == 0
+    # The caller's working directory is left alone
+    assert Path.cwd() == tmp_path
+    draws = [p.read_text() for p in out.iterdir()]
+    assert len(draws) == 2
+    assert draws[0] != draws[1]
+    # Worker databases are merged into the requested database
+    assert example_db.is_dir()